@@ -132,7 +132,7 @@ def _make_crypto_tensor(chosen_crypto_fps, no_of_cryptos, test_start_date):
 
         data_fp = os.path.join(os.getcwd(), DATA_DIR, crypto_fp)
 
-        data = pd.read_csv(data_fp).fillna("bfill").copy()
+        data = pd.read_csv(data_fp).bfill()
 
         if idx == 0:
 
@@ -1,18 +1,27 @@
 import sys
+import os
+import hashlib
+import tempfile
+import zipfile
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 import time
 import argparse
 from pprint import pprint
 
+import numpy as np
+
 from src.train_rl_algorithm import train_rl_algorithm
 from src.test_rl_algorithm import test_rl_algorithm
-from src.trading_environment import TradingEnvironment
+from src.trading_environment import TradingEnvironment, SingleAssetTradingEnvironments
 from src.params import PF_INITIAL_VALUE, TRADING_COST, INTEREST_RATE, WINDOW_LENGTH
 
 from visualization_scripts.plot_train_results import plot_train_results
 from visualization_scripts.make_train_histograms import make_train_histograms
 
 from data_pipelines import get_crypto_price_tensors
+from data_pipelines.get_data_from_poloniex_api import DATA_DIR
 
 
 DEFAULT_TRADE_ENV_ARGS = {
@@ -21,6 +30,12 @@ DEFAULT_TRADE_ENV_ARGS = {
     "trading_cost": TRADING_COST,
 }
 
+TENSOR_CACHE_DIR = os.path.join(DATA_DIR, "_cache")
+
+# Bump whenever get_crypto_price_tensors changes how the tensor is built so
+# that previously cached tensors are no longer served
+TENSOR_CACHE_VERSION = 1
+
 TRAIN_BASE_PARAMS = {
     "interactive_session": False,
     "verbose": False,
@@ -81,19 +96,25 @@ def main(**train_configs):
 
 def _initialize_trade_envs(train_configs):
 
-    dataset, asset_names, ratio_train = get_crypto_price_tensors.main(
-        no_of_cryptos=train_configs["no_of_assets"],
-        start_date=train_configs["start_date"],
-        test_start_date=train_configs["test_start_date"],
-        end_date=train_configs["end_date"],
-        trading_period_length=train_configs["trading_period_length"],
-        train_session_name=train_configs["train_session_name"],
-    )
-
-    trade_env_args = DEFAULT_TRADE_ENV_ARGS
-    trade_env_args["train_size"] = ratio_train
-    trade_env_args["data"] = dataset
-    trade_env_args["window_length"] = train_configs["window_length"]
+    dataset, asset_names, ratio_train = _get_crypto_price_tensors(train_configs)
+
+    # Reorder the price tensor from (features, assets, periods) to
+    # (assets, features, periods) so that the price window of each asset is
+    # a contiguous block of memory
+    #
+    # All trading environments share this single buffer, lock it so that no
+    # environment can modify the prices seen by the others
+    dataset = np.ascontiguousarray(np.transpose(dataset, (1, 0, 2)))
+    dataset.setflags(write=False)
+
+    # Build a fresh dict so that the module level defaults do not keep a
+    # reference to the dataset between runs
+    trade_env_args = {
+        **DEFAULT_TRADE_ENV_ARGS,
+        "train_size": ratio_train,
+        "data": dataset,
+        "window_length": train_configs["window_length"],
+    }
 
     trading_periods = dataset.shape[2]
     print("Trading periods: {}".format(dataset.shape[2]))
@@ -111,6 +132,70 @@ def _initialize_trade_envs(train_configs):
     return train_envs, asset_names, train_test_val_steps
 
 
+def _get_crypto_price_tensors(train_configs):
+    """
+    Building the price tensor parses every asset CSV of the period. Training
+    sweeps reuse the same periods over and over so the result is cached to
+    disk, keyed by the arguments that determine the tensor.
+
+    """
+    tensor_args = {
+        "no_of_cryptos": train_configs["no_of_assets"],
+        "start_date": train_configs["start_date"],
+        "test_start_date": train_configs["test_start_date"],
+        "end_date": train_configs["end_date"],
+        "trading_period_length": train_configs["trading_period_length"],
+        # the asset selection depends on the session name
+        "train_session_name": train_configs["train_session_name"],
+    }
+
+    cache_key = hashlib.sha1(
+        repr((TENSOR_CACHE_VERSION, *tensor_args.values())).encode()
+    ).hexdigest()
+    cache_fp = os.path.join(TENSOR_CACHE_DIR, f"{cache_key}.npz")
+
+    if os.path.isfile(cache_fp):
+        print(f"Loading cached price tensor from: {cache_fp}")
+        try:
+            with np.load(cache_fp) as cached:
+                return (
+                    cached["dataset"],
+                    cached["asset_names"].tolist(),
+                    float(cached["ratio_train"]),
+                )
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as error:
+            print(f"WARNING: Ignoring unreadable cache file ({error}), rebuilding")
+
+    dataset, asset_names, ratio_train = get_crypto_price_tensors.main(**tensor_args)
+
+    if not os.path.exists(TENSOR_CACHE_DIR):
+        os.makedirs(TENSOR_CACHE_DIR, exist_ok=True)
+
+    print(f"Caching price tensor to: {cache_fp}")
+
+    # Write to a temporary file and move it into place so that an interrupted
+    # or concurrent write never leaves a truncated cache file behind
+    with tempfile.NamedTemporaryFile(
+        dir=TENSOR_CACHE_DIR, suffix=".npz.tmp", delete=False
+    ) as tmp_file:
+        tmp_fp = tmp_file.name
+        try:
+            np.savez(
+                tmp_file,
+                dataset=dataset,
+                asset_names=np.array(asset_names),
+                ratio_train=ratio_train,
+            )
+        except BaseException:
+            tmp_file.close()
+            os.remove(tmp_fp)
+            raise
+
+    os.replace(tmp_fp, cache_fp)
+
+    return dataset, asset_names, ratio_train
+
+
 def _get_train_environments(no_of_assets, trade_env_args):
 
     # environment for trading of the agent
@@ -131,8 +216,9 @@ def _get_train_environments(no_of_assets, trade_env_args):
     env_s = TradingEnvironment(**trade_env_args)
 
     # full on one stock environment
-    # these environments are set up for agents who play only on one stock
-    env_fu = [TradingEnvironment(**trade_env_args) for asset in range(no_of_assets)]
+    # these portfolios are set up for agents who play only on one stock,
+    # one portfolio per asset stepped together as a single batch
+    env_fu = SingleAssetTradingEnvironments(**trade_env_args)
 
     trade_envs = {
         "policy_network": env,
@@ -148,29 +234,40 @@ def _get_train_environments(no_of_assets, trade_env_args):
 
 def _get_train_val_test_steps(trading_period, train_configs, ratio_train):
 
+    # The steps are cached, hand out a copy so that callers may modify it
+    train_test_val_steps = dict(
+        _compute_train_val_test_steps(
+            trading_period, train_configs["ratio_val"], ratio_train
+        )
+    )
+
+    print(
+        f"Test will start from idx: {train_test_val_steps['train'] + train_test_val_steps['validation']}"
+    )
+
+    return train_test_val_steps
+
+
+@lru_cache(maxsize=None)
+def _compute_train_val_test_steps(trading_period, ratio_val, ratio_train):
+
     # Total number of steps for pre-training in the training set
     total_steps_train = int(ratio_train * trading_period) + 1
 
     # Total number of steps for pre-training in the validation set
-    total_steps_val = int(train_configs["ratio_val"] * trading_period)
+    total_steps_val = int(ratio_val * trading_period)
 
     # Total number of steps for the test
     total_steps_test = trading_period - total_steps_train - total_steps_val
 
-    train_test_val_steps = {
-        "train": total_steps_train,
-        "test": total_steps_test,
-        "validation": total_steps_val,
-    }
-
-    test_start_idx = train_test_val_steps["train"] + train_test_val_steps["validation"]
-
-    print(
-        f"Test will start from idx: {train_test_val_steps['train'] + train_test_val_steps['validation']}"
+    return MappingProxyType(
+        {
+            "train": total_steps_train,
+            "test": total_steps_test,
+            "validation": total_steps_val,
+        }
     )
 
-    return train_test_val_steps
-
 
 def _calculate_start_date(end_date, trading_period_length):
 
@@ -66,7 +66,7 @@ class CNNPolicy:
 
     def _define_input_placeholders(self, nb_feature_map):
         self.x_current = tf.placeholder(
-            tf.float32, [None, nb_feature_map, self.no_of_assets, self.window_length]
+            tf.float32, [None, self.no_of_assets, nb_feature_map, self.window_length]
         )
 
         self.w_previous = tf.placeholder(tf.float32, [None, self.no_of_assets + 1])
@@ -87,7 +87,7 @@ class CNNPolicy:
 
         with tf.variable_scope("Convolution_1"):
             self.conv1 = tf.layers.conv2d(
-                inputs=tf.transpose(self.x_current, perm=[0, 3, 2, 1]),
+                inputs=tf.transpose(self.x_current, perm=[0, 3, 1, 2]),
                 activation=tf.nn.relu,  # pylint: disable=no-member
                 filters=self.n_filter_1,
                 strides=(1, 1),
@@ -127,6 +127,7 @@ class CNNPolicy:
 
         with tf.variable_scope("Policy_Output"):
             self.action = tf.nn.softmax(self.squeezed_tensor4)
+            self.squeezed_action = tf.squeeze(self.action)
 
         return shape_x_current
 
@@ -200,7 +201,7 @@ class CNNPolicy:
     def compute_new_ptf_weights(self, x_current, w_previous):
         with tf.device(self.tf_device):
             return self.sess.run(
-                tf.squeeze(self.action),
+                self.squeezed_action,
                 feed_dict={self.x_current: x_current, self.w_previous: w_previous},
             )
 
@@ -7,7 +7,7 @@ def test_rl_algorithm(  # pylint:  disable=too-many-arguments, too-many-locals
 ):
 
     print("\nTesting algorithm performance with test set")
-    no_of_assets = len(state_fu)
+    no_of_assets = train_options["no_of_assets"]
 
     weights_equal = np.array(np.array([1 / (no_of_assets + 1)] * (no_of_assets + 1)))
     weights_single = np.array(np.array([1] + [0.0] * no_of_assets))
@@ -32,12 +32,11 @@ def test_rl_algorithm(  # pylint:  disable=too-many-arguments, too-many-locals
     )
 
     full_on_one_weights = np.eye(no_of_assets + 1, dtype=int)
-    for i in range(no_of_assets):
-        state_fu[i], done_fu[i] = trade_envs["full_on_one_stocks"][i].reset_environment(
-            full_on_one_weights[i + 1, :],
-            train_options["portfolio_value"],
-            index=train_test_split["train"],
-        )
+    state_fu, done_fu = trade_envs["full_on_one_stocks"].reset_environment(
+        full_on_one_weights[1:, :],
+        train_options["portfolio_value"],
+        index=train_test_split["train"],
+    )
 
     p_list = [train_options["portfolio_value"]]
     p_list_static = [train_options["portfolio_value"]]
@@ -46,12 +45,6 @@ def test_rl_algorithm(  # pylint:  disable=too-many-arguments, too-many-locals
     p_list_eq = [train_options["portfolio_value"]]
     p_list_s = [train_options["portfolio_value"]]
 
-    p_list_fu = list()
-    for i in range(no_of_assets):
-        p_list_fu.append([train_options["portfolio_value"]])
-
-    pf_value_t_fu = [0] * no_of_assets
-
     low_index = train_test_split["train"] + train_test_split["validation"]
     up_index = (
         train_test_split["train"]
@@ -59,6 +52,10 @@ def test_rl_algorithm(  # pylint:  disable=too-many-arguments, too-many-locals
         + train_test_split["test"]
     )
 
+    # One row of portfolio values per asset, preallocated for the whole test
+    p_list_fu = np.empty((no_of_assets, up_index - low_index + 1))
+    p_list_fu[:, 0] = train_options["portfolio_value"]
+
     first_weights = []
 
     first_step = True
@@ -90,10 +87,9 @@ def test_rl_algorithm(  # pylint:  disable=too-many-arguments, too-many-locals
         )
         state_s, _, _ = trade_envs["only_cash"].step(weights_single)
 
-        for i in range(no_of_assets):
-            state_fu[i], _, done_fu[i] = trade_envs["full_on_one_stocks"][i].step(
-                full_on_one_weights[i + 1, :]
-            )
+        state_fu, _, done_fu = trade_envs["full_on_one_stocks"].step(
+            full_on_one_weights[1:, :]
+        )
 
         if first_step:
             first_step = False
@@ -103,8 +99,7 @@ def test_rl_algorithm(  # pylint:  disable=too-many-arguments, too-many-locals
 
         pf_value_t_eq = state_eq[2]
         pf_value_t_s = state_s[2]
-        for i in range(no_of_assets):
-            pf_value_t_fu[i] = state_fu[i][2]
+        pf_value_t_fu = state_fu[2]
 
         if k % 20 == 0:
             print(f"\n{k}/{up_index}")
@@ -115,8 +110,7 @@ def test_rl_algorithm(  # pylint:  disable=too-many-arguments, too-many-locals
 
         p_list_eq.append(pf_value_t_eq)
         p_list_s.append(pf_value_t_s)
-        for i in range(no_of_assets):
-            p_list_fu[i].append(pf_value_t_fu[i])
+        p_list_fu[:, idx + 1] = pf_value_t_fu
 
         pf_value_t_static = state_static[2]
         p_list_static.append(pf_value_t_static)
@@ -127,7 +121,8 @@ def test_rl_algorithm(  # pylint:  disable=too-many-arguments, too-many-locals
         "p_list_eq": p_list_eq,
         "p_list_fu": p_list_fu,
         "p_list_s": p_list_s,
-        "w_list": w_list,
+        # shape (test steps + 1, no_of_assets + 1), cash weight first
+        "w_list": np.asarray(w_list, dtype=float),
         "sharpe_ratios": {
             "p_list": (p_list[-1] - p_list[0]) / np.std(p_list),
             "p_list_static": (p_list_static[-1] - p_list_static[0])
@@ -13,6 +13,9 @@ class TradingEnvironment:  # pylint: disable=too-many-instance-attributes
         data=None,
     ):
 
+        # The price tensor has the axis order (assets, features, periods). It
+        # is shared read-only between all environments, only ever slice views
+        # out of it and never copy or write to it
         self.data = data
 
         self.portfolio_value = portfolio_value
@@ -20,7 +23,7 @@ class TradingEnvironment:  # pylint: disable=too-many-instance-attributes
         self.trading_cost = trading_cost
         self.interest_rate = interest_rate
 
-        self.nb_cryptos = self.data.shape[1]
+        self.nb_cryptos = self.data.shape[0]
         self.end_train = int((self.data.shape[2] - self.window_length) * train_size)
 
         self.index = None
@@ -38,12 +41,14 @@ class TradingEnvironment:  # pylint: disable=too-many-instance-attributes
 
     def get_crypto_returns(self):
         return np.array(
-            [1 + self.interest_rate] + self.data[-1, :, self.index].tolist()
+            [1 + self.interest_rate] + self.data[:, -1, self.index].tolist()
         )
 
     def reset_environment(self, w_init, p_init, index=0):
+        # The initial state is the price window ending at index (at least one
+        # full window in), so resets at the train/test split start from there
         self.state = (
-            self.get_crypto_prices(self.data, self.window_length),
+            self.get_crypto_prices(self.data, max(index, self.window_length)),
             w_init,
             p_init,
         )
@@ -91,3 +96,58 @@ class TradingEnvironment:  # pylint: disable=too-many-instance-attributes
         self.index = new_index
 
         return self.state, step_reward, self.done
+
+
+class SingleAssetTradingEnvironments(TradingEnvironment):
+    """
+    The "full on one stock" benchmarks of all assets stepped as one batch.
+
+    Row i of the state weights and the state portfolio values belongs to the
+    portfolio that is fully invested in asset i. This way a single vectorized
+    update replaces stepping one environment per asset.
+    """
+
+    def reset_environment(self, w_init, p_init, index=0):
+        w_init = np.asarray(w_init)
+        p_init = np.full(w_init.shape[0], p_init, dtype=float)
+
+        return super().reset_environment(w_init, p_init, index=index)
+
+    def step(self, weights_before_step, adjust_portfolio=True):
+        old_weights = self.state[1]
+        old_ptf_values = self.state[2]
+
+        if not adjust_portfolio:
+            weights_before_step = old_weights
+
+        costs = (
+            old_ptf_values
+            * np.abs(weights_before_step - old_weights).sum(axis=1)
+            * self.trading_cost
+        )
+
+        value_after_tx_costs = old_ptf_values[:, np.newaxis] * weights_before_step
+        value_after_tx_costs[:, 0] -= costs
+
+        new_crypto_values = value_after_tx_costs * self.get_crypto_returns()
+
+        new_ptf_values = np.sum(new_crypto_values, axis=1)
+
+        new_weights = new_crypto_values / new_ptf_values[:, np.newaxis]
+
+        step_rewards = (new_ptf_values - old_ptf_values) / old_ptf_values
+
+        new_index = self.index + 1
+
+        self.state = (
+            self.get_crypto_prices(self.data, new_index),
+            new_weights,
+            new_ptf_values,
+        )
+
+        if new_index >= self.end_train:
+            self.done = True
+
+        self.index = new_index
+
+        return self.state, step_rewards, self.done
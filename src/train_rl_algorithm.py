@@ -14,7 +14,7 @@ def train_rl_algorithm(train_options, trade_envs, train_test_split):
 
     print("\nInitializing Agent CNN with Tensorflow")
     benchmark_weights = _initialize_benchmark_weights(train_options["no_of_assets"])
-    nb_feature_map = trade_envs["args"]["data"].shape[0]
+    nb_feature_map = trade_envs["args"]["data"].shape[1]
     agent = CNNPolicy(
         train_options["no_of_assets"],
         train_options,
@@ -28,6 +28,10 @@ def train_rl_algorithm(train_options, trade_envs, train_test_split):
     print("\nInitializing tensorflow graphs")
     sess.run(tf.global_variables_initializer())
 
+    # The graph is complete, fail loudly if an op is added inside the
+    # train or test loops
+    sess.graph.finalize()
+
     train_performance_lists = {
         "policy_network": [],
         "equal_weighted": [],
@@ -78,6 +82,10 @@ def _train_episode(
 
     memory = np.transpose(np.array([w_init_train] * train_test_split["train"]))
 
+    batch_start_indices = _get_batch_start_indices(
+        train_options, train_test_split["train"]
+    )
+
     env_states = None
 
     for idx in range(train_options["n_batches"]):
@@ -91,20 +99,39 @@ def _train_episode(
             memory,
             trade_envs,
             benchmark_weights,
+            batch_start_indices[idx],
         )
 
     return env_states
 
 
+def _get_batch_start_indices(train_options, total_steps_train):
+    """
+    Spread the starting points of the batches evenly over the train set so
+    that consecutive batches are not trained on the same stretch of prices.
+    The benchmark environments are reset to the same index as the policy
+    network so that they stay comparable.
+
+    """
+    first_start = train_options["window_length"]
+    last_start = max(first_start, total_steps_train - train_options["batch_size"])
+
+    return np.linspace(first_start, last_start, train_options["n_batches"], dtype=int)
+
+
 def _train_batch(  # pylint: disable=too-many-arguments
-    agent, train_performance_lists, train_options, memory, trade_envs, benchmark_weights
+    agent,
+    train_performance_lists,
+    train_options,
+    memory,
+    trade_envs,
+    benchmark_weights,
+    i_start,
 ):
 
     no_of_assets = train_options["no_of_assets"]
     single_asset_pf_values_t = [0] * no_of_assets
 
-    i_start = train_options["window_length"]
-
     env_states = _reset_memory_states(
         train_options, trade_envs, memory, i_start, benchmark_weights
     )
@@ -149,19 +176,13 @@ def _reset_memory_states(train_options, trade_envs, memory, i_start, benchmark_w
         benchmark_weights["only_cash"], train_options["portfolio_value"], index=i_start
     )
 
-    state_single_assets = [0] * train_options["no_of_assets"]
-    done_single_assets = [0] * train_options["no_of_assets"]
-
-    full_on_one_weights = np.eye(train_options["no_of_assets"] + 1, dtype=int)
-
-    for i in range(train_options["no_of_assets"]):
-        state_single_assets[i], done_single_assets[i] = trade_envs[
-            "full_on_one_stocks"
-        ][i].reset_environment(
-            full_on_one_weights[i + 1, :],
-            train_options["portfolio_value"],
-            index=i_start,
-        )
+    state_single_assets, done_single_assets = trade_envs[
+        "full_on_one_stocks"
+    ].reset_environment(
+        benchmark_weights["single_assets"][1:, :],
+        train_options["portfolio_value"],
+        index=i_start,
+    )
 
     return {
         "policy_network": {"state": state, "done": policy_done},
@@ -210,11 +231,9 @@ def _train_batch_item(  # pylint: disable=too-many-arguments, too-many-locals
         agent, env_states, train_options["no_of_assets"], trade_envs, benchmark_weights
     )
 
-    new_state = _update_state(
-        env_states, single_asset_pf_values_t, train_options["no_of_assets"]
-    )
+    new_state = _update_state(env_states, single_asset_pf_values_t)
 
-    daily_return_t = new_state["x_next"][-1, :, -1]
+    daily_return_t = new_state["x_next"][:, -1, -1]
 
     memory[:, i_start + batch_item] = new_state["w_t"]
 
@@ -277,19 +296,16 @@ def _take_train_step(agent, env_states, no_of_assets, trade_envs, benchmark_weig
         benchmark_weights["only_cash"]
     )
 
-    for i in range(no_of_assets):
-        (
-            env_states["single_assets_states"][i],
-            _,
-            env_states["single_assets_done"][i],
-        ) = trade_envs["full_on_one_stocks"][i].step(
-            benchmark_weights["single_assets"][i + 1, :]
-        )
+    (
+        env_states["single_assets_states"],
+        _,
+        env_states["single_assets_done"],
+    ) = trade_envs["full_on_one_stocks"].step(benchmark_weights["single_assets"][1:, :])
 
     return x_t, w_previous
 
 
-def _update_state(env_states, single_asset_pf_values_t, no_of_assets):
+def _update_state(env_states, single_asset_pf_values_t):
 
     x_next = env_states["policy_network"]["state"][0]
     w_t = env_states["policy_network"]["state"][1]
@@ -298,8 +314,7 @@ def _update_state(env_states, single_asset_pf_values_t, no_of_assets):
     pf_value_t_eq = env_states["equal_weighted"]["state"][2]
     pf_value_t_s = env_states["only_cash"]["state"][2]
 
-    for i in range(no_of_assets):
-        single_asset_pf_values_t[i] = env_states["single_assets_states"][i][2]
+    single_asset_pf_values_t[:] = env_states["single_assets_states"][2]
 
     new_state = {
         "x_next": x_next,
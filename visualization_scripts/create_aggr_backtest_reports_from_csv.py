@@ -4,7 +4,6 @@ import os
 import csv
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 
 from pprint import pprint
 
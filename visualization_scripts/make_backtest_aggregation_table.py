@@ -154,32 +154,33 @@ def make_backtest_aggregation_table():
 
 def _extract_key_stats(backtest_name, backtest_dict):
 
+    # Filtering copies the graphs of the valid runs to their own directory
     filtered_history = filter_history_dict(
         backtest_dict, backtest_name, move_valid_to_own_dir=True)
 
-    n_simulations = len(filtered_history)
+    backtest_stats = aggregate_backtest_stats(
+        filtered_history, already_filtered=True)
 
-    if not n_simulations:
+    if backtest_stats is None:
         print(f'\nWARNING: Could not create histogram for session {backtest_name}. No valid test runs found from total {len(backtest_dict)}\n')
         return []
 
-    backtest_stats = aggregate_backtest_stats(
-        filtered_history)
+    n_simulations = backtest_stats["n_simulations"]
 
     return [
         f"{backtest_stats['test_start']} to {backtest_stats['test_end']}",
         backtest_stats["trading_period_length"],
         n_simulations,
-        np.round(np.mean(backtest_stats["dynamic_pf_values"]), 4),
-        np.round(np.mean(backtest_stats["dynamic_mdds"]), 4),
-        np.round(np.mean(backtest_stats["dynamic_sharpe_ratios"]), 4),
-        # np.round(np.mean(backtest_stats["dynamic_sharpe_ratios_ann"]), 4),
+        np.round(backtest_stats["dynamic_pf_values_mean"], 4),
+        np.round(backtest_stats["dynamic_mdds_mean"], 4),
+        np.round(backtest_stats["dynamic_sharpe_ratios_mean"], 4),
+        # np.round(backtest_stats["dynamic_sharpe_ratios_ann_mean"], 4),
 
 
-        np.round(np.mean(backtest_stats["static_pf_values"]), 4),
-        np.round(np.mean(backtest_stats["static_mdds"]), 4),
-        np.round(np.mean(backtest_stats["static_sharpe_ratios"]), 4),
-        # np.round(np.mean(backtest_stats["static_sharpe_ratios_ann"]), 4),
+        np.round(backtest_stats["static_pf_values_mean"], 4),
+        np.round(backtest_stats["static_mdds_mean"], 4),
+        np.round(backtest_stats["static_sharpe_ratios_mean"], 4),
+        # np.round(backtest_stats["static_sharpe_ratios_ann_mean"], 4),
 
 
         np.round(backtest_stats["eq_pf_value"], 4),
@@ -187,8 +188,8 @@ def _extract_key_stats(backtest_name, backtest_dict):
         np.round(backtest_stats["eq_sharpe_ratio"], 4),
         # np.round(backtest_stats["eq_sharpe_ratio_ann"], 4),
 
-        np.round(np.mean(backtest_stats["dynamic_stdevs"]), 4),
-        np.round(np.mean(backtest_stats["static_stdevs"]), 4),
+        np.round(backtest_stats["dynamic_stdevs_mean"], 4),
+        np.round(backtest_stats["static_stdevs_mean"], 4),
     ]
 
 
@@ -1,45 +1,109 @@
 from shutil import copyfile
 from datetime import datetime
+from multiprocessing import Pool
 import os
-import numpy as np
-import seaborn as sns
 import json
-import matplotlib.pyplot as plt
-from matplotlib.font_manager import FontProperties
-from mpl_toolkits.axes_grid1 import make_axes_locatable
+import numpy as np
+import orjson
+import matplotlib
+from matplotlib.collections import LineCollection
+from matplotlib.transforms import blended_transform_factory
+
+# The histogram sweep only writes PNG files, so run as a script it uses the
+# non-interactive Agg backend. Pool workers started with the spawn method
+# import this module as __mp_main__ and need the same backend. When imported,
+# the caller's backend is kept.
+if __name__ in ("__main__", "__mp_main__"):
+    matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # pylint: disable=wrong-import-position
 
 
 JSON_OUTPUT_DIR = "train_jsons/"
 
 HISTOGRAM_OUTPUT_DIR = "train_histograms/"
 
+HISTOGRAM_FIGSIZE = (16.6, 23.4)  # width, height
+
 VALID_GRAPH_DIR = "valid_graphs/"
 
 TRAIN_GRAPHS_DIR = "train_graphs/"
 
+TEST_START_DATES = [
+    "2016-09-07",
+    "2016-12-08",
+    "2017-03-07",
+    "2017-05-28",
+    "2017-11-23",
+    "2018-11-10",
+    "2019-03-06",
+]
+
+TEST_END_DATES = [
+    "2016-10-28",
+    "2017-01-28",
+    "2017-04-27",
+    "2017-07-18",
+    "2018-01-13",
+    "2018-12-31",
+    "2019-04-26",
+]
+
+SIMULATION_STAT_NAMES = [
+    "dynamic_pf_values",
+    "dynamic_mdds",
+    "dynamic_sharpe_ratios",
+    "dynamic_sharpe_ratios_ann",
+    "dynamic_stdevs",
+    "static_pf_values",
+    "static_mdds",
+    "static_sharpe_ratios",
+    "static_sharpe_ratios_ann",
+    "static_stdevs",
+    "cash_investments",
+    "crypto_weight_averages",
+    "crypto_weight_std_devs",
+]
+
 if not os.path.exists(HISTOGRAM_OUTPUT_DIR):
     os.mkdir(HISTOGRAM_OUTPUT_DIR)
 
 
-def make_train_histograms(session_name):
+def make_train_histograms(session_name, fig=None):
+    """
+    Pass in a figure to draw several sessions on the same canvas, it is
+    cleared before plotting. Without one a new figure is created and closed
+    after saving.
+
+    """
     json_path = os.path.join(JSON_OUTPUT_DIR, f"train_history_{session_name}.json")
 
-    with open(json_path, "r") as file:
-        history_dict = json.load(file)
+    with open(json_path, "rb") as file:
+        history_bytes = file.read()
 
-    filtered_history = filter_history_dict(history_dict, session_name)
-    n_simulations = len(filtered_history)
+    try:
+        history_dict = orjson.loads(history_bytes)
+    except orjson.JSONDecodeError:
+        # plot_train_results writes the history with json.dump, which emits
+        # bare NaN and Infinity for diverged runs. orjson rejects those.
+        history_dict = json.loads(history_bytes)
 
-    if not n_simulations:
+    backtest_stats = aggregate_backtest_stats(history_dict)
+
+    if backtest_stats is None:
         print(f'\nWARNING: Could not create histogram for session {session_name}. No valid test runs found from total {len(history_dict)}\n')
         return
 
-    backtest_stats = aggregate_backtest_stats(filtered_history)
+    n_simulations = backtest_stats["n_simulations"]
 
-    fig, axes = plt.subplots(nrows=5, ncols=2)
+    owns_figure = fig is None
 
-    # width, height
-    fig.set_size_inches(16.6, 23.4)
+    if owns_figure:
+        fig = plt.figure(figsize=HISTOGRAM_FIGSIZE)
+    else:
+        fig.clear()
+
+    axes = fig.subplots(nrows=5, ncols=2)
 
     gs = axes[0][0].get_gridspec()
     axes[0][0].remove()
@@ -103,41 +167,52 @@ def make_train_histograms(session_name):
         "Stdev of weights",
     )
     output_path = os.path.join(HISTOGRAM_OUTPUT_DIR, f"histogram_{session_name}.png")
-    plt.subplots_adjust(hspace=0.5)
+    fig.subplots_adjust(hspace=0.5)
     print(f"Saving plot to path: {output_path}")
-    plt.savefig(output_path, bbox_inches="tight")
+    fig.savefig(output_path, bbox_inches="tight")
+
+    if owns_figure:
+        plt.close(fig)
+
 
+def aggregate_backtest_stats(history_dict, already_filtered=False):
+    """
+    Filters out the invalid backtests of the history and aggregates the
+    statistics of the remaining ones in a single pass. Returns None if no
+    valid backtest is found.
 
-def aggregate_backtest_stats(filtered_history):
-    dynamic_pf_values = []
-    dynamic_mdds = []
-    dynamic_sharpe_ratios = []
-    dynamic_sharpe_ratios_ann = []
-    dynamic_stdevs = []
+    Pass already_filtered=True for the output of filter_history_dict to skip
+    validating every backtest a second time.
 
-    static_pf_values = []
-    static_mdds = []
-    static_sharpe_ratios = []
-    static_sharpe_ratios_ann = []
-    static_stdevs = []
+    """
+    max_simulations = len(history_dict)
 
-    cash_investments = []
-    crypto_weight_averages = []
-    crypto_weight_std_devs = []
+    simulation_stats = {
+        stat_name: np.empty(max_simulations) for stat_name in SIMULATION_STAT_NAMES
+    }
 
-    first_key = list(filtered_history.keys())[0]
+    n_simulations = 0
+    n_dynamic_sharpe_ratios_ann = 0
+    n_static_sharpe_ratios_ann = 0
 
-    asset_list = filtered_history[first_key]["asset_list"]
-    eq_pf_value = filtered_history[first_key]["eq_weight"]["pf_value"]
-    eq_sharpe_ratio = filtered_history[first_key]["eq_weight"]["sharpe_ratio"]
-    eq_mdd = filtered_history[first_key]["eq_weight"]["mdd"]
+    first_key = None
     eq_sharpe_ratio_ann = 0
 
     test_start = "NA"
     test_end = "NA"
     trading_period_length = "NA"
 
-    for timestamp, session_stats in filtered_history.items():
+    for timestamp, session_stats in history_dict.items():
+
+        if not already_filtered and not _is_valid_backtest(timestamp, session_stats):
+            continue
+
+        if first_key is None:
+            first_key = timestamp
+            asset_list = session_stats["asset_list"]
+            eq_pf_value = session_stats["eq_weight"]["pf_value"]
+            eq_sharpe_ratio = session_stats["eq_weight"]["sharpe_ratio"]
+            eq_mdd = session_stats["eq_weight"]["mdd"]
 
         if "test_start" in session_stats:
             test_start = session_stats["test_start"]
@@ -154,46 +229,56 @@ def aggregate_backtest_stats(filtered_history):
 
         initial_weights = session_stats["initial_weights"]
 
-        dynamic_pf_values.append(dynamic["pf_value"])
-        dynamic_mdds.append(dynamic["mdd"])
-        dynamic_sharpe_ratios.append(dynamic["sharpe_ratio"])
-        dynamic_stdevs.append(dynamic["std_dev"])
+        idx = n_simulations
+        n_simulations += 1
+
+        simulation_stats["dynamic_pf_values"][idx] = dynamic["pf_value"]
+        simulation_stats["dynamic_mdds"][idx] = dynamic["mdd"]
+        simulation_stats["dynamic_sharpe_ratios"][idx] = dynamic["sharpe_ratio"]
+        simulation_stats["dynamic_stdevs"][idx] = dynamic["std_dev"]
 
-        try:
-            dynamic_sharpe_ratios_ann.append(dynamic["sharpe_ratio_ann"])
-        except KeyError:
-            pass
+        if "sharpe_ratio_ann" in dynamic:
+            simulation_stats["dynamic_sharpe_ratios_ann"][
+                n_dynamic_sharpe_ratios_ann] = dynamic["sharpe_ratio_ann"]
+            n_dynamic_sharpe_ratios_ann += 1
 
-        static_pf_values.append(static["pf_value"])
-        static_mdds.append(static["mdd"])
-        static_sharpe_ratios.append(static["sharpe_ratio"])
-        static_stdevs.append(static["std_dev"])
+        simulation_stats["static_pf_values"][idx] = static["pf_value"]
+        simulation_stats["static_mdds"][idx] = static["mdd"]
+        simulation_stats["static_sharpe_ratios"][idx] = static["sharpe_ratio"]
+        simulation_stats["static_stdevs"][idx] = static["std_dev"]
 
-        try:
-            static_sharpe_ratios_ann.append(static["sharpe_ratio_ann"])
-        except KeyError:
-            pass
+        if "sharpe_ratio_ann" in static:
+            simulation_stats["static_sharpe_ratios_ann"][
+                n_static_sharpe_ratios_ann] = static["sharpe_ratio_ann"]
+            n_static_sharpe_ratios_ann += 1
 
-        cash_investments.append(initial_weights[0])
+        simulation_stats["cash_investments"][idx] = initial_weights[0]
 
         crypto_weights = initial_weights[1:]
-        crypto_weight_averages.append(np.mean(crypto_weights))
-        crypto_weight_std_devs.append(np.std(crypto_weights))
+        simulation_stats["crypto_weight_averages"][idx] = np.mean(crypto_weights)
+        simulation_stats["crypto_weight_std_devs"][idx] = np.std(crypto_weights)
+
+    if not n_simulations:
+        return None
+
+    stat_counts = {stat_name: n_simulations for stat_name in SIMULATION_STAT_NAMES}
+    stat_counts["dynamic_sharpe_ratios_ann"] = n_dynamic_sharpe_ratios_ann
+    stat_counts["static_sharpe_ratios_ann"] = n_static_sharpe_ratios_ann
+
+    # Truncate each statistic to the valid backtests and precompute the
+    # moments shown in the metadata table
+    backtest_stats = {}
+    for stat_name, stat_values in simulation_stats.items():
+        stat_values = stat_values[:stat_counts[stat_name]]
+        if not stat_values.size:
+            stat_values = np.array([42.0])
+        backtest_stats[stat_name] = stat_values
+        backtest_stats[f"{stat_name}_mean"] = stat_values.mean()
+        backtest_stats[f"{stat_name}_std"] = stat_values.std()
 
     return {
-        "dynamic_pf_values": dynamic_pf_values,
-        "dynamic_mdds": dynamic_mdds,
-        "dynamic_sharpe_ratios": dynamic_sharpe_ratios,
-        "dynamic_sharpe_ratios_ann": dynamic_sharpe_ratios_ann if dynamic_sharpe_ratios_ann else [42],
-        "dynamic_stdevs": dynamic_stdevs,
-        "static_pf_values": static_pf_values,
-        "static_mdds": static_mdds,
-        "static_sharpe_ratios": static_sharpe_ratios,
-        "static_sharpe_ratios_ann": static_sharpe_ratios_ann if static_sharpe_ratios_ann else [42],
-        "static_stdevs": static_stdevs,
-        "cash_investments": cash_investments,
-        "crypto_weight_averages": crypto_weight_averages,
-        "crypto_weight_std_devs": crypto_weight_std_devs,
+        **backtest_stats,
+        "n_simulations": n_simulations,
         "first_key": first_key,
         "asset_list": asset_list,
         "eq_pf_value": eq_pf_value,
@@ -206,62 +291,50 @@ def aggregate_backtest_stats(filtered_history):
     }
 
 
-def filter_history_dict(history_dict, session_name, move_valid_to_own_dir=False):
+def _is_valid_backtest(timestamp, train_data):
+    initial_weights = train_data["initial_weights"]
 
-    test_start_dates = [
-        "2016-09-07",
-        "2016-12-08",
-        "2017-03-07",
-        "2017-05-28",
-        "2017-11-23",
-        "2018-11-10",
-        "2019-03-06",
-    ]
+    timestamp_dt = datetime.strptime(timestamp, "%Y-%m-%d_%H%M%S")
 
-    test_end_dates = [
-        "2016-10-28",
-        "2017-01-28",
-        "2017-04-27",
-        "2017-07-18",
-        "2018-01-13",
-        "2018-12-31",
-        "2019-04-26",
-    ]
+    sat_threshold_dt = datetime(2019, 4, 27, 15, 30)
 
-    filtered_history = {}
-    for timestamp, train_data in history_dict.items():
-        initial_weights = train_data["initial_weights"]
+    if timestamp_dt < sat_threshold_dt:
+        return False
 
-        timestamp_dt = datetime.strptime(timestamp, "%Y-%m-%d_%H%M%S")
+    test_start = train_data['test_start']
+    test_end = train_data['test_end']
 
-        sat_threshold_dt = datetime(2019, 4, 27, 15, 30)
+    if test_start not in TEST_START_DATES:
+        return False
+    if test_end not in TEST_END_DATES:
+        return False
 
-        if timestamp_dt < sat_threshold_dt:
-            continue
+    sun_threshold_dt = datetime(2019, 4, 28, 18, 0)
 
-        test_start = train_data['test_start']
-        test_end = train_data['test_end']
+    if timestamp_dt < sun_threshold_dt:
+        trading_period_length = train_data['trading_period_length']
+        if trading_period_length in ["15min", "30min", "2h", "4h", "1d"]:
+            # if trading_period_length in ["5min", "15min", "30min", "2h",
+            # "4h", "1d"]:
+            return False
 
-        if test_start not in test_start_dates:
-            continue
-        if test_end not in test_end_dates:
-            continue
+    # Ignore train runs with negative weight
+    if min(initial_weights) < 0:
+        return False
 
-        sun_threshold_dt = datetime(2019, 4, 28, 18, 0)
+    # Ignore train runs with huge weight
+    if max(initial_weights) > 0.11:
+        return False
 
-        if timestamp_dt < sun_threshold_dt:
-            trading_period_length = train_data['trading_period_length']
-            if trading_period_length in ["15min", "30min", "2h", "4h", "1d"]:
-                # if trading_period_length in ["5min", "15min", "30min", "2h",
-                # "4h", "1d"]:
-                continue
+    return True
 
-        # Ignore train runs with negative weight
-        if any(value < 0 for value in initial_weights):
-            continue
 
-        # Ignore train runs with huge weight
-        if any(value > 0.11 for value in initial_weights):
+def filter_history_dict(history_dict, session_name, move_valid_to_own_dir=False):
+
+    filtered_history = {}
+    for timestamp, train_data in history_dict.items():
+
+        if not _is_valid_backtest(timestamp, train_data):
             continue
 
         filtered_history[timestamp] = train_data
@@ -301,8 +374,6 @@ def filter_history_dict(history_dict, session_name, move_valid_to_own_dir=False)
 
 def _plot_histogram_metadata_table(axis, n_simulations, session_name, backtest_stats):
 
-    divider = make_axes_locatable(axis)
-
     axis.set_axis_off()
 
     axis.set_title(
@@ -311,166 +382,84 @@ def _plot_histogram_metadata_table(axis, n_simulations, session_name, backtest_s
         horizontalalignment="left",
     )
 
-    dynamic_columns = ("Dynamic agent", "Average", "Stdev")
-    dynamic_data = [
-        [
-            "Ptf. value",
-            round(np.mean(backtest_stats["dynamic_pf_values"]), 4),
-            round(np.std(backtest_stats["dynamic_pf_values"]), 4),
-        ],
-        [
-            "Sharpe ratio",
-            round(np.mean(backtest_stats["dynamic_sharpe_ratios"]), 4),
-            round(np.std(backtest_stats["dynamic_sharpe_ratios"]), 4),
-        ],
-        [
-            "Sharpe ratio (ann)",
-            round(np.mean(backtest_stats["dynamic_sharpe_ratios_ann"]), 4),
-            round(np.std(backtest_stats["dynamic_sharpe_ratios_ann"]), 4),
-        ],
-        [
-            "MDD",
-            round(np.mean(backtest_stats["dynamic_mdds"]), 4),
-            round(np.std(backtest_stats["dynamic_mdds"]), 4),
-        ],
-        [
-            "Average of weights",
-            round(np.mean(backtest_stats["crypto_weight_averages"]), 4),
-            round(np.std(backtest_stats["crypto_weight_averages"]), 4),
-        ],
-        [
-            "Stdev of weights",
-            round(np.mean(backtest_stats["crypto_weight_std_devs"]), 4),
-            round(np.std(backtest_stats["crypto_weight_std_devs"]), 4),
-        ],
-        [
-            "Cash weight (BTC)",
-            round(np.mean(backtest_stats["cash_investments"]), 4),
-            round(np.std(backtest_stats["cash_investments"]), 4),
-        ],
+    # (row name, agent statistic, equal weighted statistic)
+    agent_rows = [
+        ("Ptf. value", "pf_values", "eq_pf_value"),
+        ("Sharpe ratio", "sharpe_ratios", "eq_sharpe_ratio"),
+        ("Sharpe ratio (ann)", "sharpe_ratios_ann", "eq_sharpe_ratio_ann"),
+        ("MDD", "mdds", "eq_mdd"),
     ]
 
-    dynamic_table = axis.table(
-        cellText=dynamic_data,
-        colLabels=dynamic_columns,
-        loc="center",
-        cellLoc="center",
-        colWidths=[0.4, 0.3, 0.3],
-    )
-    _format_table(dynamic_table)
-
-    static_columns = ("Static agent", "Average", "Stdev")
-    static_data = [
-        [
-            "Ptf. value",
-            round(np.mean(backtest_stats["static_pf_values"]), 4),
-            round(np.std(backtest_stats["static_pf_values"]), 4),
-        ],
-        [
-            "Sharpe ratio",
-            round(np.mean(backtest_stats["static_sharpe_ratios"]), 4),
-            round(np.std(backtest_stats["static_sharpe_ratios"]), 4),
-        ],
-        [
-            "Sharpe ratio (ann)",
-            round(np.mean(backtest_stats["static_sharpe_ratios_ann"]), 4),
-            round(np.std(backtest_stats["static_sharpe_ratios_ann"]), 4),
-        ],
-        [
-            "MDD",
-            round(np.mean(backtest_stats["static_mdds"]), 4),
-            round(np.std(backtest_stats["static_mdds"]), 4),
-        ],
-        [
-            "Average of weights",
-            round(np.mean(backtest_stats["crypto_weight_averages"]), 4),
-            round(np.std(backtest_stats["crypto_weight_averages"]), 4),
-        ],
-        [
-            "Stdev of weights",
-            round(np.mean(backtest_stats["crypto_weight_std_devs"]), 4),
-            round(np.std(backtest_stats["crypto_weight_std_devs"]), 4),
-        ],
-        [
-            "Cash weight (BTC)",
-            round(np.mean(backtest_stats["cash_investments"]), 4),
-            round(np.std(backtest_stats["cash_investments"]), 4),
-        ],
+    # The initial weights are shared by both agents
+    weight_rows = [
+        ("Average of weights", "crypto_weight_averages"),
+        ("Stdev of weights", "crypto_weight_std_devs"),
+        ("Cash weight (BTC)", "cash_investments"),
     ]
 
-    axis1 = divider.append_axes("right", size="100%", pad=0.15, sharex=axis)
-    axis1.set_axis_off()
-
-    static_table = axis1.table(
-        cellText=static_data,
-        colLabels=static_columns,
-        loc="center",
-        cellLoc="center",
-        colWidths=[0.4, 0.3, 0.3],
-    )
-    _format_table(static_table)
-
-    axis2 = divider.append_axes("right", size="55%", pad=0.15, sharex=axis)
-    axis2.set_axis_off()
-
-    eq_columns = ("Equal weighted", "Average")
-    eq_data = [
-        ["Ptf. value", round(backtest_stats["eq_pf_value"], 4)],
-        ["Sharpe ratio", round(backtest_stats["eq_sharpe_ratio"], 4)],
-        ["Sharpe ratio (ann)", round(
-            backtest_stats["eq_sharpe_ratio_ann"], 4)],
-        ["MDD", round(backtest_stats["eq_mdd"], 4)],
+    table_lines = [
+        f"{'':<20}{'Dynamic agent':>28}{'Static agent':>28}{'Equal weighted':>18}",
+        f"{'':<20}" + f"{'Average':>14}{'Stdev':>14}" * 2 + f"{'Average':>18}",
     ]
 
-    eq_table = axis2.table(
-        cellText=eq_data,
-        colLabels=eq_columns,
-        loc="center",
-        cellLoc="center",
-        colWidths=[0.6, 0.4],
-    )
-    _format_table(eq_table)
-
-    axis3 = divider.append_axes("right", size="55%", pad=0.15, sharex=axis)
-    axis3.set_axis_off()
-
-    crypto_columns = ("Parameter", "Value")
-    crypto_table_data = [
-        ["No. of simulations", n_simulations],
-        ["No. of assets", len(backtest_stats["asset_list"])],
-        ["Start date", backtest_stats["test_start"]],
-        ["End date", backtest_stats["test_end"]],
-        ["Trading period", backtest_stats["trading_period_length"]],
+    for row_name, stat_name, eq_stat_name in agent_rows:
+        table_lines.append(
+            f"{row_name:<20}"
+            f"{backtest_stats[f'dynamic_{stat_name}_mean']:>14.4f}"
+            f"{backtest_stats[f'dynamic_{stat_name}_std']:>14.4f}"
+            f"{backtest_stats[f'static_{stat_name}_mean']:>14.4f}"
+            f"{backtest_stats[f'static_{stat_name}_std']:>14.4f}"
+            f"{backtest_stats[eq_stat_name]:>18.4f}"
+        )
+
+    for row_name, stat_name in weight_rows:
+        table_lines.append(
+            f"{row_name:<20}"
+            + f"{backtest_stats[f'{stat_name}_mean']:>14.4f}"
+            f"{backtest_stats[f'{stat_name}_std']:>14.4f}" * 2
+        )
+
+    table_lines += [
+        "",
+        f"{'No. of simulations':<20}{n_simulations:>14}",
+        f"{'No. of assets':<20}{len(backtest_stats['asset_list']):>14}",
+        f"{'Start date':<20}{backtest_stats['test_start']:>14}",
+        f"{'End date':<20}{backtest_stats['test_end']:>14}",
+        f"{'Trading period':<20}{backtest_stats['trading_period_length']:>14}",
     ]
 
-    crypto_table = axis3.table(
-        cellText=crypto_table_data,
-        colLabels=crypto_columns,
-        loc="center",
-        cellLoc="center",
-        colWidths=[0.6, 0.4],
+    axis.text(
+        0,
+        0.5,
+        "\n".join(table_lines),
+        family="monospace",
+        fontsize=10,
+        verticalalignment="center",
+        transform=axis.transAxes,
     )
-    _format_table(crypto_table)
 
 
-def _format_table(table):
-    for (row, col), cell in table.get_celld().items():
-        if row == 0:
-            cell.set_text_props(
-                fontproperties=FontProperties(weight="bold"), color="white"
-            )
-            cell.set_facecolor("#4C72B0")
+def _plot_histogram(axis, data, title, xlabel):
+    num_bins = 15
 
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.scale(1.0, 2)
+    # NaN samples (e.g. a 0/0 Sharpe ratio) cannot be binned, drop them
+    data = np.asarray(data, dtype=float)
+    finite_data = data[np.isfinite(data)]
 
+    if finite_data.size > 0:
+        counts, bin_edges = np.histogram(finite_data, bins=num_bins)
+        axis.bar(
+            bin_edges[:-1], counts, width=np.diff(bin_edges), align="edge", alpha=0.4
+        )
 
-def _plot_histogram(axis, data, title, xlabel):
-    num_bins = 15
+        # Rug of the individual samples as a single artist, x in data and y in
+        # axes coordinates
+        rug = LineCollection(
+            [[(value, 0), (value, 0.05)] for value in finite_data],
+            transform=blended_transform_factory(axis.transData, axis.transAxes),
+        )
+        axis.add_collection(rug, autolim=False)
 
-    sns.distplot(data, bins=num_bins, ax=axis, rug=True, kde=False)
-    # axis.hist(data, num_bins, alpha=0.95)
     axis.grid(alpha=0.3)
     axis.set_xlabel(xlabel)
     axis.set_ylabel("Count")
@@ -480,11 +469,24 @@ def _plot_histogram(axis, data, title, xlabel):
 
 if __name__ == "__main__":
 
-    for backtest_json_fn in os.listdir(JSON_OUTPUT_DIR):
+    plt.ioff()
+
+    session_names = [
+        backtest_json_fn.replace('train_history_', "").replace(".json", "")
+        for backtest_json_fn in os.listdir(JSON_OUTPUT_DIR)
+    ]
+
+    print(session_names)
+
+    n_processes = min(len(session_names), os.cpu_count() or 1)
 
-        session_name = backtest_json_fn.replace(
-            'train_history_', "").replace(".json", "")
+    if n_processes > 1:
+        # Each session is read, aggregated and plotted independently
+        with Pool(processes=n_processes) as pool:
+            pool.map(make_train_histograms, session_names)
 
-        print(session_name)
+    else:
+        histogram_fig = plt.figure(figsize=HISTOGRAM_FIGSIZE)
 
-        make_train_histograms(session_name)
+        for session_name in session_names:
+            make_train_histograms(session_name, fig=histogram_fig)
@@ -147,7 +147,7 @@ def plot_train_results(  # pylint: disable= too-many-arguments, too-many-locals
             "sharpe_ratio_ann": eq_annualized_sharpe,
             "mdd": test_performance_lists["max_drawdowns"]["p_list_eq"],
         },
-        "initial_weights": list(test_performance_lists["w_list"][1]),
+        "initial_weights": test_performance_lists["w_list"][1].tolist(),
         "asset_list": asset_list,
         "test_start": test_start,
         "test_end": test_end,
@@ -421,7 +421,7 @@ def _get_btc_price_data_for_period(train_configs, train_test_val_steps):
         f"{t_confs['start_date']}-{t_confs['end_date']}",
         btc_price_fn,
     )
-    data = pd.read_csv(btc_price_fp).fillna("bfill").copy()
+    data = pd.read_csv(btc_price_fp).bfill()
 
 
     # Set BTC price data index to real date
@@ -432,43 +432,29 @@ def _get_btc_price_data_for_period(train_configs, train_test_val_steps):
         train_test_val_steps["train"] + train_test_val_steps["validation"] :
     ]
 
-    btc_price_sharpe = (btc_data_test_period[-1] - btc_data_test_period[0]) / np.std(
-        btc_data_test_period
-    )
+    # Compute the reference Sharpe on the raw ndarray instead of the Series to
+    # avoid positional lookups and dtype dispatch on the datetime index
+    btc_prices = btc_data_test_period.to_numpy()
+    btc_price_sharpe = (btc_prices[-1] - btc_prices[0]) / btc_prices.std()
 
     return btc_data_test_period, btc_price_sharpe
 
 def _plot_weight_evolution(axis, asset_list, w_list, btc_price_data):
 
-    names = [CASH_NAME] + asset_list
-    w_list = np.array(w_list)
-
     markers = ["2", ".", "x", "+", "1"]
 
-    cash_idx = None
-    for j in range(len(asset_list) + 1):
-        if names[j] == CASH_NAME:
-            cash_idx = j
-            continue
-
-        w_list_series = pd.Series(w_list[1:, j], btc_price_data.index[1:])
-
-        axis.plot(
-            w_list_series,
-            label="{} weight".format(names[j]),
-            alpha=0.95,
-            linestyle="",
-            marker=markers[j % len(markers)],
-        )
-
-    cash_list_series = pd.Series(w_list[1:, cash_idx], btc_price_data.index[1:])
-
-    axis.plot(
-        cash_list_series,
-        label="{} weight".format(names[cash_idx]),
-        alpha=0.95,
-        linestyle="-",
+    # Crypto weights are drawn as markers and the cash weight, which is in
+    # the first column of w_list, as a line on top of them
+    weights_df = pd.DataFrame(
+        np.column_stack((w_list[1:, 1:], w_list[1:, 0])),
+        index=btc_price_data.index[1:].rename(None),
+        columns=[
+            "{} weight".format(name) for name in asset_list + [CASH_NAME]
+        ],
     )
+    styles = [markers[j % len(markers)] for j in range(1, len(asset_list) + 1)]
+
+    weights_df.plot(ax=axis, style=styles + ["-"], alpha=0.95, x_compat=True)
 
     axis.set_title("Portfolio weight evolution")
     axis.legend()